@@ -29,6 +29,7 @@ from bpy.props import (
         BoolProperty,
         EnumProperty,
         FloatProperty,
+        IntProperty,
         StringProperty,
         CollectionProperty,
         )
@@ -46,6 +47,12 @@ class ImportSMF(bpy.types.Operator, ImportHelper):
     filename_ext = ".smf"
     filter_glob: StringProperty(default="*.smf", options={'HIDDEN'})
 
+    texture_search_paths: StringProperty(
+        name="Extra Texture Folders",
+        description="Additional folders to search for textures after the game ART folder, separated by ';'",
+        default=""
+    )
+
     def execute(self, context):
         from . import import_smf
         keywords = self.as_keywords(ignore=("axis_forward",
@@ -92,6 +99,40 @@ class ExportSMF(bpy.types.Operator, ExportHelper):
         default=False
     )
 
+    enable_chunking: BoolProperty(
+        name="Split Large Objects",
+        description="Split oversized objects into spatial chunks so the game can cull them individually",
+        default=False
+    )
+
+    chunk_mode: EnumProperty(
+        name="Chunk Mode",
+        items=(('GRID', "Grid", "Split along a uniform ground plane grid"),
+               ('QUADTREE', "Quadtree", "Recursively halve the object bounds along the ground axes that are over the chunk size")),
+        default='GRID'
+    )
+
+    chunk_size: FloatProperty(
+        name="Chunk Size",
+        description="Maximum ground plane size of a chunk, in meters",
+        default=100.0,
+        min=1.0
+    )
+
+    chunk_max_verts: IntProperty(
+        name="Max Chunk Vertices",
+        description="Maximum number of vertices in a single chunk",
+        default=65535,
+        min=3
+    )
+
+    chunk_max_tris: IntProperty(
+        name="Max Chunk Triangles",
+        description="Maximum number of triangles in a single chunk",
+        default=65535,
+        min=1
+    )
+
     def execute(self, context):
         from . import export_smf
 
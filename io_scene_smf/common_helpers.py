@@ -11,6 +11,48 @@ import bpy
 import os
 from bpy_extras import  node_shader_utils
 
+from . import import_tex
+
+class TextureIndex:
+    """Case insensitive lookup of texture files, scanned once per import"""
+    def __init__(self, search_paths):
+        self.files = {}
+        self.missing = set()
+        self.unreadable = []
+
+        for search_path in search_paths:
+            self.scan(search_path)
+
+    def scan(self, search_path):
+        if not os.path.isdir(search_path):
+            return
+
+        # earlier search paths take priority
+        try:
+            with os.scandir(search_path) as entries:
+                for entry in entries:
+                    stem, extension = os.path.splitext(entry.name)
+                    if entry.is_file():
+                        self.files.setdefault(stem.lower(), {}).setdefault(extension.lower(), entry.path)
+        except OSError as e:
+            print(f"WARN: could not read texture folder {search_path!r}: {e}")
+            self.unreadable.append(search_path)
+
+    def find(self, name, extension):
+        return self.files.get(name.lower(), {}).get(extension.lower())
+
+    def find_or_report(self, name, extension):
+        path = self.find(name, extension)
+        if path is None:
+            self.missing.add(name + extension.upper())
+        return path
+
+
+def is_null_texture(texture_name):
+    # the exporter writes NULL for objects without a texture
+    return texture_name is None or texture_name == "" or texture_name.upper() == "NULL"
+
+
 def get_image_file(image):
     return os.path.splitext(image.name)[0]
 
@@ -42,37 +84,37 @@ def find_existing_material(texture_name, bump_texture_name, reflective, transpar
     return None
 
 
-def create_material(texture_name, bump_texture_name, art_path, reflective = False, transparent = False):
+def create_material(texture_name, bump_texture_name, texture_index, reflective = False, transparent = False):
     # create a new material
     # find existing texture(s)
     main_texture_image = None
     bump_texture_image = None
+    load_main_texture = not is_null_texture(texture_name)
+    load_bump_texture = not is_null_texture(bump_texture_name)
 
-    main_image_path = None
-    bump_image_path = None
-
-    if bump_texture_name is not None:
-        main_image_path = os.path.join(art_path, texture_name + ".TIF")
-        bump_image_path = os.path.join(art_path, bump_texture_name + ".TIF")
+    if load_main_texture:
         main_texture_image = bpy.data.images.get(texture_name)
+    if load_bump_texture:
         bump_texture_image = bpy.data.images.get(bump_texture_name)
-    else:
-        main_image_path = os.path.join(art_path, texture_name + ".RAW")
-        main_texture_image = bpy.data.images.get(texture_name)
 
     # load image(s) if they're not already loaded
-    if main_texture_image is None and os.path.exists(main_image_path):
-        if main_image_path.endswith(".TIF"):
-            main_texture_image = bpy.data.images.load(main_image_path)
-            if main_texture_image is not None:
-                main_texture_image.name = os.path.splitext(main_texture_image.name)[0]
+    if main_texture_image is None and load_main_texture:
+        if bump_texture_name is not None:
+            main_image_path = texture_index.find_or_report(texture_name, ".TIF")
+            if main_image_path is not None:
+                main_texture_image = bpy.data.images.load(main_image_path)
+                main_texture_image.name = texture_name
         else:
-            bpy.ops.import_texture.evo_tex(filepath=main_image_path)
-            main_texture_image = bpy.data.images.get(texture_name)
-    if bump_texture_image is None and bump_image_path is not None and os.path.exists(bump_image_path):
-        bump_texture_image = bpy.data.images.load(bump_image_path)
-        if bump_texture_image is not None:
-            bump_texture_image.name = os.path.splitext(bump_texture_image.name)[0]
+            main_image_path = texture_index.find_or_report(texture_name, ".RAW")
+            colortable_path = texture_index.find_or_report(texture_name, ".ACT") if main_image_path is not None else None
+            if colortable_path is not None:
+                opacity_path = texture_index.find(texture_name, ".OPA")
+                main_texture_image = import_tex.load_raw_image(main_image_path, colortable_path, opacity_path, texture_name)
+    if bump_texture_image is None and load_bump_texture:
+        bump_image_path = texture_index.find_or_report(bump_texture_name, ".TIF")
+        if bump_image_path is not None:
+            bump_texture_image = bpy.data.images.load(bump_image_path)
+            bump_texture_image.name = bump_texture_name
             bump_texture_image.colorspace_settings.name = 'Non-Color'
 
     # setup material
@@ -97,10 +139,10 @@ def create_material(texture_name, bump_texture_name, art_path, reflective = Fals
 
     return mtl
 
-def get_or_create_material(texture_name, bump_texture_name, art_path, reflective = False, transparent = False):
+def get_or_create_material(texture_name, bump_texture_name, texture_index, reflective = False, transparent = False):
     # look for an existing material first
     existing_material = find_existing_material(texture_name, bump_texture_name, reflective, transparent)
     if existing_material is not None:
         return existing_material
 
-    return create_material(texture_name, bump_texture_name, art_path, reflective, transparent)
\ No newline at end of file
+    return create_material(texture_name, bump_texture_name, texture_index, reflective, transparent)
\ No newline at end of file
@@ -12,10 +12,224 @@ import bpy, bmesh
 
 from . import common_helpers as helper
 
+######################################################
+# CHUNKING
+######################################################
+# maximum subdivision depth when splitting a chunk to fit the limits
+CHUNK_MAX_DEPTH = 8
+
+def get_triangle_centroid(verts, tri):
+    a, b, c = verts[tri[0]], verts[tri[1]], verts[tri[2]]
+    return ((a[0] + b[0] + c[0]) / 3.0, (a[1] + b[1] + c[1]) / 3.0, (a[2] + b[2] + c[2]) / 3.0)
+
+
+def get_bounds(points):
+    bounds_min = [min(p[i] for p in points) for i in range(3)]
+    bounds_max = [max(p[i] for p in points) for i in range(3)]
+    return (bounds_min, bounds_max)
+
+
+def get_ground_extent(points):
+    # only the ground plane (x/z) counts towards the size, the game culls per object
+    bounds_min, bounds_max = get_bounds(points)
+    return max(bounds_max[0] - bounds_min[0], bounds_max[2] - bounds_min[2])
+
+
+def count_unique_verts(tris):
+    return len({idx for tri in tris for idx in tri})
+
+
+def chunk_fits_limits(tris, max_verts, max_tris):
+    return len(tris) <= max_tris and count_unique_verts(tris) <= max_verts
+
+
+def get_oversized_axes(verts, tris, chunk_size):
+    # triangles aren't clipped, so a chunk may reach past the chunk size by its largest triangle
+    largest_tri = max(get_ground_extent([verts[idx] for idx in tri]) for tri in tris)
+    bounds_min, bounds_max = get_bounds([verts[idx] for tri in tris for idx in tri])
+    return [axis for axis in (0, 2) if bounds_max[axis] - bounds_min[axis] > chunk_size + largest_tri]
+
+
+def chunk_fits_size(verts, tris, chunk_size):
+    return len(get_oversized_axes(verts, tris, chunk_size)) == 0
+
+
+def split_median(tris, centroids, max_verts, max_tris):
+    if len(tris) <= 1 or chunk_fits_limits(tris, max_verts, max_tris):
+        return [tris]
+
+    # cut in half along the longest axis
+    bounds_min, bounds_max = get_bounds(centroids)
+    axis = max(range(3), key=lambda i: bounds_max[i] - bounds_min[i])
+    order = sorted(range(len(tris)), key=lambda i: centroids[i][axis])
+    half = len(order) // 2
+
+    chunks = []
+    for half_order in (order[:half], order[half:]):
+        chunks.extend(split_median([tris[i] for i in half_order], [centroids[i] for i in half_order], max_verts, max_tris))
+    return chunks
+
+
+def split_quadtree(verts, tris, centroids, chunk_size, max_verts, max_tris, depth = 0):
+    if len(tris) <= 1:
+        return [tris]
+
+    # only the limits are exceeded, keep triangles sharing ground space together
+    split_axes = get_oversized_axes(verts, tris, chunk_size)
+    if len(split_axes) == 0:
+        return split_median(tris, centroids, max_verts, max_tris)
+
+    # halve the axes that are over the chunk size
+    bounds_min, bounds_max = get_bounds(centroids)
+    center = [(bounds_min[i] + bounds_max[i]) * 0.5 for i in range(3)]
+
+    cells = {}
+    for tri, centroid in zip(tris, centroids):
+        key = tuple(centroid[axis] > center[axis] for axis in split_axes)
+        cell_tris, cell_centroids = cells.setdefault(key, ([], []))
+        cell_tris.append(tri)
+        cell_centroids.append(centroid)
+
+    # spatial splitting can't go any further, fall back to splitting by count
+    if depth >= CHUNK_MAX_DEPTH or len(cells) == 1:
+        chunks = split_median(tris, centroids, max_verts, max_tris)
+        for chunk_tris in chunks:
+            if not chunk_fits_size(verts, chunk_tris, chunk_size):
+                print(f"WARN: a chunk of {len(chunk_tris)} tris could not be split below the chunk size")
+        return chunks
+
+    chunks = []
+    for key in sorted(cells):
+        cell_tris, cell_centroids = cells[key]
+        chunks.extend(split_quadtree(verts, cell_tris, cell_centroids, chunk_size, max_verts, max_tris, depth + 1))
+    return chunks
+
+
+def split_grid(tris, centroids, chunk_size, max_verts, max_tris):
+    cells = {}
+    for tri, centroid in zip(tris, centroids):
+        key = (int(centroid[0] // chunk_size), int(centroid[2] // chunk_size))
+        cell_tris, cell_centroids = cells.setdefault(key, ([], []))
+        cell_tris.append(tri)
+        cell_centroids.append(centroid)
+
+    # cells that are still too dense get split further
+    chunks = []
+    for key in sorted(cells):
+        cell_tris, cell_centroids = cells[key]
+        chunks.extend(split_median(cell_tris, cell_centroids, max_verts, max_tris))
+    return chunks
+
+
+def remap_chunk(verts, tris):
+    chunk_verts = []
+    chunk_tris = []
+    index_map = {}
+
+    for tri in tris:
+        remapped_tri = []
+        for idx in tri:
+            if not idx in index_map:
+                index_map[idx] = len(chunk_verts)
+                chunk_verts.append(verts[idx])
+            remapped_tri.append(index_map[idx])
+        chunk_tris.append(tuple(remapped_tri))
+
+    return (chunk_verts, chunk_tris)
+
+
+def chunk_geometry(name, verts, tris, chunk_mode, chunk_size, max_verts, max_tris):
+    if len(tris) == 0 or (chunk_fits_limits(tris, max_verts, max_tris) and chunk_fits_size(verts, tris, chunk_size)):
+        return [(name, verts, tris)]
+
+    centroids = [get_triangle_centroid(verts, tri) for tri in tris]
+    if chunk_mode == 'GRID':
+        chunk_tri_lists = split_grid(tris, centroids, chunk_size, max_verts, max_tris)
+    else:
+        chunk_tri_lists = split_quadtree(verts, tris, centroids, chunk_size, max_verts, max_tris)
+
+    chunks = []
+    for chunk_index, chunk_tris in enumerate(chunk_tri_lists):
+        chunk_verts, chunk_tris = remap_chunk(verts, chunk_tris)
+        chunks.append((f"{name}_C{chunk_index:03d}", chunk_verts, chunk_tris))
+    return chunks
+
+
+def report_chunks(name, chunks):
+    print(f"  {name}: split into {len(chunks)} chunks")
+    for chunk_name, chunk_verts, chunk_tris in chunks:
+        bounds_min, bounds_max = get_bounds(chunk_verts)
+        print(f"    {chunk_name}: {len(chunk_verts)} verts, {len(chunk_tris)} tris, "
+              f"bounds (ft) ({bounds_min[0]:.2f}, {bounds_min[1]:.2f}, {bounds_min[2]:.2f}) - "
+              f"({bounds_max[0]:.2f}, {bounds_max[1]:.2f}, {bounds_max[2]:.2f})")
+
+
 ######################################################
 # EXPORT MAIN FILES
 ######################################################
-def export_smf(file, apply_modifiers, enable_switching, switch_height, use_v1_materials):
+def build_geometry(ob, apply_modifiers):
+    # scaling factor
+    M_TO_FT = (1.0 / 0.3048)
+
+    # create temp mesh
+    temp_mesh = None
+    if apply_modifiers:
+        dg = bpy.context.evaluated_depsgraph_get()
+        eval_obj = ob.evaluated_get(dg)
+        temp_mesh = eval_obj.to_mesh()
+    else:
+        temp_mesh = ob.to_mesh()
+    
+    # get bmesh
+    bm = bmesh.new()
+    bm.from_mesh(temp_mesh)
+    bm.verts.ensure_lookup_table()
+    bm.normal_update()
+    bm_tris = bm.calc_loop_triangles()
+    uv_layer = bm.loops.layers.uv.verify()
+
+    # translate vertices to world
+    for vert in bm.verts:
+        vert.co = ob.matrix_world @ vert.co
+
+    # calculate split geometry
+    verts = []
+    loop_to_vert_map = {}
+    loop_index_to_vert_map = {}
+
+    for tri_loops in bm_tris:
+        for loop in tri_loops:
+            # prepare our hash entry
+            uv_hash =  str(loop[uv_layer].uv)
+            pos_hash = str(loop.vert.co)
+            nrm_hash = str(loop.vert.normal)
+
+            loop_hash = uv_hash + "|" + pos_hash + "|" + nrm_hash
+
+            # add to the table
+            if not loop_hash in loop_to_vert_map:
+                vert_tup = (loop.vert.co.x * -1.0 * M_TO_FT, loop.vert.co.z * M_TO_FT, loop.vert.co.y * -1.0 * M_TO_FT,
+                            loop.vert.normal.x * -1.0, loop.vert.normal.z, loop.vert.normal.y * -1.0,
+                            loop[uv_layer].uv[0], 1.0 - loop[uv_layer].uv[1])
+
+                loop_to_vert_map[loop_hash] = len(verts)
+                loop_index_to_vert_map[loop.index] = len(verts)
+
+                verts.append(vert_tup)
+            else:
+                loop_index_to_vert_map[loop.index] = loop_to_vert_map[loop_hash]
+
+    # build triangle list (flipped winding)
+    tris = [(loop_index_to_vert_map[face[2].index], loop_index_to_vert_map[face[1].index], loop_index_to_vert_map[face[0].index]) for face in bm_tris]
+
+    # clean up
+    bm.free()
+
+    return (verts, tris)
+
+
+def export_smf(operator, file, apply_modifiers, enable_switching, switch_height, use_v1_materials,
+               enable_chunking = False, chunk_mode = 'GRID', chunk_size = 100.0, chunk_max_verts = 65535, chunk_max_tris = 65535):
     scn = bpy.context.scene
 
     # scaling factor
@@ -23,68 +237,39 @@ def export_smf(file, apply_modifiers, enable_switching, switch_height, use_v1_ma
     
     export_objects = [ob for ob in scn.objects if ob.type == 'MESH']
 
+    # gather geometry up front, chunking changes the object count
+    export_chunks = []
+    split_object_count = 0
+    for ob in export_objects:
+        verts, tris = build_geometry(ob, apply_modifiers)
+        chunks = [(ob.name, verts, tris)]
+        if enable_chunking:
+            chunks = chunk_geometry(ob.name, verts, tris, chunk_mode, chunk_size * M_TO_FT, chunk_max_verts, chunk_max_tris)
+            if len(chunks) > 1:
+                report_chunks(ob.name, chunks)
+                split_object_count += 1
+        for chunk in chunks:
+            export_chunks.append((ob, *chunk))
+
+    if split_object_count > 0:
+        operator.report({'INFO'}, f"Split {split_object_count} object(s), exporting {len(export_chunks)} objects in total. See the system console for chunk bounds.")
+        if enable_switching:
+            operator.report({'WARNING'}, "Objects were split with LOD switching enabled, high and low detail chunks won't line up with each other.")
+
     file.write("C3DModel\n")
     file.write("4\n") # version
-    file.write(f"{len(export_objects)}\n")
+    file.write(f"{len(export_chunks)}\n")
     file.write(f"{int(enable_switching)},{switch_height:.6f}\n")
 
-    for ob in export_objects:
+    for ob, name, verts, tris in export_chunks:
         # write header
-        file.write(f"{ob.name}\n")
+        file.write(f"{name}\n")
         file.write(f"{int(not ob.hide_get())}\n")
         file.write("1\n") # object version
 
-        # create temp mesh
-        temp_mesh = None
-        if apply_modifiers:
-            dg = bpy.context.evaluated_depsgraph_get()
-            eval_obj = ob.evaluated_get(dg)
-            temp_mesh = eval_obj.to_mesh()
-        else:
-            temp_mesh = ob.to_mesh()
-        
-        # get bmesh
-        bm = bmesh.new()
-        bm.from_mesh(temp_mesh)
-        bm.verts.ensure_lookup_table()
-        bm.normal_update()
-        bm_tris = bm.calc_loop_triangles()
-        uv_layer = bm.loops.layers.uv.verify()
-
-        # translate vertices to world
-        for vert in bm.verts:
-            vert.co = ob.matrix_world @ vert.co
-
-        # calculate split geometry
-        verts = []
-        loop_to_vert_map = {}
-        loop_index_to_vert_map = {}
-
-        for tri_loops in bm_tris:
-            for loop in tri_loops:
-                # prepare our hash entry
-                uv_hash =  str(loop[uv_layer].uv)
-                pos_hash = str(loop.vert.co)
-                nrm_hash = str(loop.vert.normal)
-
-                loop_hash = uv_hash + "|" + pos_hash + "|" + nrm_hash
-
-                # add to the table
-                if not loop_hash in loop_to_vert_map:
-                    vert_tup = (loop.vert.co.x * -1.0 * M_TO_FT, loop.vert.co.z * M_TO_FT, loop.vert.co.y * -1.0 * M_TO_FT,
-                                loop.vert.normal.x * -1.0, loop.vert.normal.z, loop.vert.normal.y * -1.0,
-                                loop[uv_layer].uv[0], 1.0 - loop[uv_layer].uv[1])
-
-                    loop_to_vert_map[loop_hash] = len(verts)
-                    loop_index_to_vert_map[loop.index] = len(verts)
-
-                    verts.append(vert_tup)
-                else:
-                    loop_index_to_vert_map[loop.index] = loop_to_vert_map[loop_hash]
-
         # write geometry info
         num_verts = len(verts)
-        num_faces = len(bm_tris)
+        num_faces = len(tris)
         num_frames = 1
 
         file.write(f"{num_verts},{num_frames},{num_faces},0\n")
@@ -112,13 +297,8 @@ def export_smf(file, apply_modifiers, enable_switching, switch_height, use_v1_ma
         for x in range(num_verts):
             x, y, z, nx, ny, nz, u, v = verts[x]
             file.write(f"{x:.6f},{y:.6f},{z:.6f},{nx:.6f},{ny:.6f},{nz:.6f},{u:.6f},{v:.6f}\n")
-        for x in range(num_faces):
-            face = bm_tris[x]
-            indices = (loop_index_to_vert_map[face[2].index], loop_index_to_vert_map[face[1].index], loop_index_to_vert_map[face[0].index])
-            file.write(f"{indices[0]},{indices[1]},{indices[2]}\n")
-
-        # clean up
-        bm.free()
+        for tri in tris:
+            file.write(f"{tri[0]},{tri[1]},{tri[2]}\n")
 
     # finish off
     file.close()
@@ -134,6 +314,11 @@ def save(operator,
          enable_switching=False,
          switch_height=50.0,
          use_v1_materials = False,
+         enable_chunking = False,
+         chunk_mode = 'GRID',
+         chunk_size = 100.0,
+         chunk_max_verts = 65535,
+         chunk_max_tris = 65535,
          ):
 
     print("exporting SMF: %r..." % (filepath))
@@ -141,7 +326,8 @@ def save(operator,
 
     # write smf
     file = open(filepath, 'w')
-    export_smf(file, apply_modifiers, enable_switching, switch_height, use_v1_materials)
+    export_smf(operator, file, apply_modifiers, enable_switching, switch_height, use_v1_materials,
+               enable_chunking, chunk_mode, chunk_size, chunk_max_verts, chunk_max_tris)
 
     # smf export complete
     print(" done in %.4f sec." % (time.perf_counter() - time1))
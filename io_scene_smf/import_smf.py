@@ -22,15 +22,11 @@ def read_line(file):
     else:
         return None
 
-def read_smf_file(file, filepath):
+def read_smf_file(file, filepath, texture_index):
     scn = bpy.context.scene
 
     # scaling factor
     FT_TO_M = 0.3048
-        
-    # get art folder path for texture loading
-    game_dir = os.path.abspath(os.path.join(os.path.dirname(filepath), ".."))
-    art_dir = os.path.join(game_dir, "ART")
 
     # read header
     header = read_line(file)
@@ -142,7 +138,7 @@ def read_smf_file(file, filepath):
                 print(str(e))
 
         # create the material
-        mtl = helper.get_or_create_material(material_name, material_bump_name, art_dir, material_is_reflective, material_is_transparent)
+        mtl = helper.get_or_create_material(material_name, material_bump_name, texture_index, material_is_reflective, material_is_transparent)
         ob.data.materials.append(mtl)
 
         # clean up
@@ -154,7 +150,8 @@ def read_smf_file(file, filepath):
 # IMPORT
 ######################################################
 def load_smf(filepath,
-             context):
+             context,
+             texture_search_paths):
 
     print("importing SMF: %r..." % (filepath))
 
@@ -164,20 +161,35 @@ def load_smf(filepath,
     time1 = time.perf_counter()
     file = open(filepath, 'r')
 
+    # index the art folder (and any extra folders) for texture loading
+    game_dir = os.path.abspath(os.path.join(os.path.dirname(filepath), ".."))
+    search_paths = [os.path.join(game_dir, "ART")]
+    search_paths.extend(bpy.path.abspath(p.strip()) for p in texture_search_paths.split(";") if p.strip())
+    texture_index = helper.TextureIndex(search_paths)
+
     # start reading our smf file
-    read_smf_file(file, filepath)
+    read_smf_file(file, filepath, texture_index)
 
     print(" done in %.4f sec." % (time.perf_counter() - time1))
     file.close()
 
+    return texture_index
+
 
 def load(operator,
          context,
          filepath="",
+         texture_search_paths="",
          ):
 
-    load_smf(filepath,
-             context,
-             )
+    texture_index = load_smf(filepath,
+                             context,
+                             texture_search_paths,
+                             )
+
+    if len(texture_index.unreadable) > 0:
+        operator.report({'WARNING'}, f"Could not read {len(texture_index.unreadable)} texture folder(s): {', '.join(texture_index.unreadable)}")
+    if len(texture_index.missing) > 0:
+        operator.report({'WARNING'}, f"Missing {len(texture_index.missing)} texture file(s): {', '.join(sorted(texture_index.missing))}")
 
     return {'FINISHED'}
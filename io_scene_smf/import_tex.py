@@ -14,6 +14,57 @@ import os
 from bpy.props import StringProperty
 from bpy_extras.io_utils import ImportHelper
 
+def load_raw_image(filepath, colortable_path, opacity_path, image_name):
+    image_data = None
+    opacity_data = None
+    image_colors = None
+
+    # read file data
+    with open(filepath, mode='rb') as file:
+        image_data = file.read()
+
+    if len(image_data) % 2 != 0:
+        raise Exception("Cannot determine the size of this RAW file.")
+
+    # read additional file data
+    with open(colortable_path, mode='rb') as file:
+        image_colors = file.read()
+
+    if opacity_path is not None:
+        with open(opacity_path, mode='rb') as file:
+            opacity_data = file.read()
+        if len(opacity_data) != len(image_data):
+            print("WARN: opacity_data is not the same size as image_data, it will be discarded.")
+            opacity_data = None
+
+    # deal with file data
+    image_size = int(math.sqrt(len(image_data)))
+
+    im = bpy.data.images.new(name=image_name, width=image_size, height=image_size, alpha=(opacity_data is not None))
+    pixels = list(im.pixels)
+
+    for y in range(image_size):
+        for x in range(image_size):
+            flipped_y = image_size - y - 1
+
+            b_pixel_index = 4 * ((flipped_y * image_size) + x)
+            pixel_index = (y * image_size) + x
+
+            color_index = image_data[pixel_index]
+            pixel_color = (image_colors[(color_index * 3):((color_index * 3) + 3)])
+            pixel_alpha = 255 if opacity_data is None else opacity_data[pixel_index]
+
+            pixels[b_pixel_index] = pixel_color[0] / 255.0
+            pixels[b_pixel_index+1] = pixel_color[1] / 255.0
+            pixels[b_pixel_index+2] = pixel_color[2] / 255.0
+            pixels[b_pixel_index+3] = pixel_alpha / 255.0
+
+    im.pixels = pixels[:]
+    im.update()
+
+    return im
+
+
 class ImportEVOTexture(bpy.types.Operator, ImportHelper):
     """Import image from Terminal Reality RAW/OPA/ACT file format"""
     bl_idname = "import_texture.evo_tex"
@@ -24,6 +75,8 @@ class ImportEVOTexture(bpy.types.Operator, ImportHelper):
     filter_glob: StringProperty(default="*.raw", options={'HIDDEN'})
 
     def execute(self, context):
+        from . import common_helpers
+
         keywords = self.as_keywords(ignore=("axis_forward",
                                             "axis_up",
                                             "filter_glob",
@@ -32,58 +85,17 @@ class ImportEVOTexture(bpy.types.Operator, ImportHelper):
         filepath = self.properties.filepath
         image_name = bpy.path.display_name_from_filepath(self.properties.filepath)
 
-        image_data = None
-        opacity_data = None
-        image_colors = None
-
-        # read file data
-        with open(filepath, mode='rb') as file:
-            image_data = file.read()
-
-        if len(image_data) % 2 != 0:
-            raise Exception("Cannot determine the size of this RAW file.")
+        # find additional files, ignoring extension case
+        directory, filename = os.path.split(os.path.abspath(filepath))
+        stem = os.path.splitext(filename)[0]
+        texture_index = common_helpers.TextureIndex([directory])
+        colortable_path = texture_index.find(stem, ".ACT")
+        opacity_path = texture_index.find(stem, ".OPA")
 
-        # read additional file data
-        opacity_path = os.path.splitext(filepath)[0] + ".OPA"
-        colortable_path = os.path.splitext(filepath)[0] + ".ACT"
-
-        if not os.path.exists(colortable_path):
+        if colortable_path is None:
             raise Exception("Missing ACT file.")
 
-        with open(colortable_path, mode='rb') as file:
-            image_colors = file.read()
-
-        if os.path.exists(opacity_path):
-            with open(opacity_path, mode='rb') as file:
-                opacity_data = file.read()
-            if len(opacity_data) != len(image_data):
-                print("WARN: opacity_data is not the same size as image_data, it will be discarded.")
-                opacity_data = None
-
-        # deal with file data
-        image_size = int(math.sqrt(len(image_data)))
-
-        im = bpy.data.images.new(name=image_name, width=image_size, height=image_size, alpha=(opacity_data is not None))
-        pixels = list(im.pixels)
-
-        for y in range(image_size):
-            for x in range(image_size):
-                flipped_y = image_size - y - 1
-
-                b_pixel_index = 4 * ((flipped_y * image_size) + x)
-                pixel_index = (y * image_size) + x
-
-                color_index = image_data[pixel_index]
-                pixel_color = (image_colors[(color_index * 3):((color_index * 3) + 3)])
-                pixel_alpha = 255 if opacity_data is None else opacity_data[pixel_index]
-
-                pixels[b_pixel_index] = pixel_color[0] / 255.0
-                pixels[b_pixel_index+1] = pixel_color[1] / 255.0
-                pixels[b_pixel_index+2] = pixel_color[2] / 255.0
-                pixels[b_pixel_index+3] = pixel_alpha / 255.0
-
-        im.pixels = pixels[:]
-        im.update()
+        load_raw_image(filepath, colortable_path, opacity_path, image_name)
 
         return {'FINISHED'}
 